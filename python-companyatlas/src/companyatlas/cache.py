@@ -0,0 +1,117 @@
+"""In-process caching for provider lookups."""
+
+from __future__ import annotations
+
+import copy
+import functools
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable
+
+MISSING = object()
+
+
+class TTLCache:
+    """Thread-safe LRU cache whose entries expire after a time-to-live.
+
+    ``None`` values (nothing found) only live for ``negative_ttl`` seconds so that
+    a lookup that failed is retried sooner than one that succeeded. ``hits`` and
+    ``misses`` count get() outcomes, to help tune the TTLs.
+    """
+
+    def __init__(self, maxsize: int = 10_000, ttl: float = 3600, negative_ttl: float = 60) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self._data: OrderedDict[Any, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: Any, default: Any = MISSING) -> Any:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Any, value: Any) -> None:
+        ttl = self.negative_ttl if value is None else self.ttl
+        with self._lock:
+            self._data[key] = (time.monotonic() + ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self.hits = self.misses = 0
+
+
+class ExpiringStore:
+    """Give a store whose ``set()`` takes ``expire`` seconds the TTLCache expiry rules.
+
+    Wraps e.g. a ``diskcache.Cache`` or ``FanoutCache`` so that found results live
+    ``ttl`` seconds and ``None`` (not found) only ``negative_ttl`` seconds::
+
+        InseeProvider.reference_cache = ExpiringStore(diskcache.FanoutCache("/tmp/atlas"))
+    """
+
+    def __init__(self, store: Any, ttl: float = 3600, negative_ttl: float = 60) -> None:
+        self.store = store
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+
+    def get(self, key: Any, default: Any = MISSING) -> Any:
+        return self.store.get(key, default)
+
+    def set(self, key: Any, value: Any) -> None:
+        self.store.set(key, value, expire=self.negative_ttl if value is None else self.ttl)
+
+
+def cached_reference(method: Callable[..., Any]) -> Callable[..., Any]:
+    """Cache a provider's search_company_by_reference result per provider, config, cleaned code and ``raw``.
+
+    Entries live in the provider's ``reference_cache``: a TTLCache by default, or any
+    object with ``get(key, default)`` and ``set(key, value)`` that expires entries
+    itself, such as an ExpiringStore around a ``diskcache.Cache`` to share lookups
+    across worker processes. An HTTP 404 from
+    the provider is returned and cached as ``None``, like any other not-found result.
+    The key includes a digest of the resolved config, so instances pointed at another
+    BASE_URL or holding other credentials never see each other's results.
+    Each caller gets its own deep copy, so mutating a result never alters the cache.
+    """
+
+    @functools.wraps(method)
+    def wrapper(self: Any, code: str, *args: Any, **kwargs: Any) -> Any:
+        if not code:
+            return method(self, code, *args, **kwargs)
+        # Only code and raw shape the result; other kwargs are providerkit routing
+        # arguments (attribute_search, ...) passed through by call_providers.
+        raw = args[0] if args else kwargs.get("raw", False)
+        key = (self.name, self._config_fingerprint(), self._clean_reference(code), bool(raw))
+        value = self.reference_cache.get(key, MISSING)
+        if value is MISSING:
+            try:
+                value = method(self, code, *args, **kwargs)
+            except Exception as exc:
+                if getattr(getattr(exc, "response", None), "status_code", None) != 404:
+                    raise
+                value = None
+            self.reference_cache.set(key, value)
+        return value if value is None else copy.deepcopy(value)
+
+    return wrapper
@@ -50,6 +50,18 @@ def search_company_by_reference(code: str, *args: Any, **kwargs: Any) -> Any:
     )
 
 
+def search_companies_by_reference(codes: list[str], *args: Any, max_workers: int = 20, **kwargs: Any) -> dict[str, Any]:
+    """Search several companies by reference concurrently, keyed by code."""
+    from concurrent.futures import ThreadPoolExecutor
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            code: executor.submit(search_company_by_reference, code, *args, **kwargs)
+            for code in dict.fromkeys(codes)
+        }
+    return {code: future.result() for code, future in futures.items()}
+
+
 def get_company_documents(code: str, *args: Any, **kwargs: Any) -> Any:
     """Get company documents using providers."""
     return call_providers(
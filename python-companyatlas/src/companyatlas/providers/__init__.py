@@ -1,6 +1,12 @@
 from __future__ import annotations
 
-from typing import Any
+import hashlib
+import json
+import os
+import threading
+from functools import lru_cache
+from importlib.util import find_spec
+from typing import Any, Callable
 
 from providerkit import ProviderBase
 
@@ -12,6 +18,74 @@ from .. import (
     COMPANYATLAS_GET_REFERENTIEL_FIELDS,
     COMPANYATLAS_SEARCH_COMPANY_FIELDS,
 )
+from ..cache import TTLCache
+from ..ratelimit import RateLimiter
+
+try:
+    import orjson
+
+    json_loads = orjson.loads
+except ImportError:
+    json_loads = json.loads
+
+HAS_REQUESTS = find_spec("requests") is not None
+
+_PACKAGES_INSTALLED: dict[str, bool] = {}
+_ENV_KEYS: dict[tuple[str, str, str], tuple[str, ...]] = {}
+
+
+def _env_keys(config_prefix: str, provider_name: str, key: str) -> tuple[str, ...]:
+    """Environment variable names tried for a config key, most specific first."""
+    cache_key = (config_prefix, provider_name, key)
+    names = _ENV_KEYS.get(cache_key)
+    if names is None:
+        provider_name_upper = provider_name.upper().replace("-", "_")
+        key_upper = key.upper()
+        names = (f"{provider_name_upper}_{key_upper}", key_upper)
+        if config_prefix:
+            names = (f"{config_prefix}_{provider_name_upper}_{key_upper}", *names)
+        _ENV_KEYS[cache_key] = names
+    return names
+
+
+@lru_cache(maxsize=256)
+def _split_path(path: str) -> tuple[str, ...]:
+    """Split a dotted path once; provider paths are a small static set."""
+    return tuple(path.split("."))
+
+
+def _resolve_first(data: Any, paths: tuple[tuple[str, ...], ...]) -> Any:
+    """First non-None value among pre-split paths."""
+    for path in paths:
+        value = _resolve_path(data, path)
+        if value is not None:
+            return value
+    return None
+
+
+def _walk_path(data: Any, path: tuple[str, ...]) -> Any:
+    """Walk a pre-split dotted path through dicts, list indexes and attributes; None when missing."""
+    current = data
+    for part in path:
+        if isinstance(current, dict):
+            current = current.get(part)
+        elif isinstance(current, list):
+            try:
+                index = int(part)
+            except ValueError:
+                return None
+            current = current[index] if 0 <= index < len(current) else None
+        else:
+            current = getattr(current, part, None)
+        if current is None:
+            return None
+    return current
+
+
+def _resolve_path(data: Any, path: tuple[str, ...]) -> Any:
+    """Value at a pre-split path, calling it when it is callable, like _normalize_recursive."""
+    current = _walk_path(data, path)
+    return current() if callable(current) else current
 
 
 class CompanyAtlasProvider(ProviderBase):
@@ -64,6 +138,271 @@ class CompanyAtlasProvider(ProviderBase):
             "fields": COMPANYATLAS_GET_REFERENTIEL_FIELDS,
         }
     }
+    _http_session: Any = None
+    _http_session_lock = threading.Lock()
+    config_defaults: dict[str, Any] = {}
+    # (requests per second, burst). Keep the burst at 1 for a per-window quota: a full
+    # bucket lets the burst through on top of the refill within the same window.
+    rate_limit: tuple[float, int] | None = None
+    http_timeout: tuple[float, float] = (3.05, 10)
+    # Largest page size the upstream search accepts; a bigger limit is answered with an error.
+    max_search_limit: int | None = None
+    _rate_limiters: dict[str, RateLimiter] = {}
+    _rate_limiters_lock = threading.Lock()
+    reference_cache = TTLCache(maxsize=10_000, ttl=3600, negative_ttl=60)
+    validator_cache = TTLCache(maxsize=1_000, ttl=86400)
+
+    @classmethod
+    def get_http_session(cls) -> Any:
+        """Get the requests session shared by all providers (keep-alive and connection pooling)."""
+        if CompanyAtlasProvider._http_session is not None:
+            return CompanyAtlasProvider._http_session
+        with CompanyAtlasProvider._http_session_lock:
+            if CompanyAtlasProvider._http_session is None:
+                if not HAS_REQUESTS:
+                    raise ImportError("requests is required for HTTP providers: pip install requests")
+                import requests
+                from requests.adapters import HTTPAdapter
+                from urllib3.util import Retry
+
+                retry = Retry(
+                    total=3,
+                    backoff_factor=0.3,
+                    status_forcelist=[429, 500, 502, 503, 504],
+                    raise_on_status=False,
+                )
+                adapter = HTTPAdapter(pool_connections=32, pool_maxsize=64, max_retries=retry)
+                session = requests.Session()
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                CompanyAtlasProvider._http_session = session
+            return CompanyAtlasProvider._http_session
+
+    @classmethod
+    def close_http_session(cls) -> None:
+        """Close the shared requests session; the next call opens a new one."""
+        with CompanyAtlasProvider._http_session_lock:
+            if CompanyAtlasProvider._http_session is not None:
+                CompanyAtlasProvider._http_session.close()
+                CompanyAtlasProvider._http_session = None
+
+    def _rate_limiter(self) -> RateLimiter | None:
+        """Token bucket shared by every instance of this provider, from rate_limit (per second, burst)."""
+        if self.rate_limit is None:
+            return None
+        limiter = CompanyAtlasProvider._rate_limiters.get(self.name)
+        if limiter is None:
+            with CompanyAtlasProvider._rate_limiters_lock:
+                limiter = CompanyAtlasProvider._rate_limiters.setdefault(self.name, RateLimiter(*self.rate_limit))
+        return limiter
+
+    def _search_limit(self, limit: int) -> int:
+        """limit clamped to what the provider's search endpoint accepts (1 to max_search_limit)."""
+        limit = max(1, limit)
+        return limit if self.max_search_limit is None else min(limit, self.max_search_limit)
+
+    def _get_json(self, url: str, revalidate: bool = False, **kwargs: Any) -> Any:
+        """GET url through the shared session and decode the JSON body.
+
+        With revalidate (reference lookups), a response carrying an ETag or
+        Last-Modified header is remembered and the next request for the same URL
+        and params is sent as a conditional GET: a 304 decodes the body stored last
+        time instead of downloading it again. Search pages are never stored.
+        """
+        kwargs.setdefault("timeout", self.http_timeout)
+        key = cached = None
+        if revalidate:
+            params = kwargs.get("params")
+            key = (url, tuple(sorted(params.items())) if isinstance(params, dict) else params)
+            cached = self.validator_cache.get(key, None)
+        if cached is not None:
+            headers = dict(kwargs.get("headers") or {})
+            etag, last_modified, _ = cached
+            if etag:
+                headers["If-None-Match"] = etag
+            if last_modified:
+                headers["If-Modified-Since"] = last_modified
+            kwargs["headers"] = headers
+        limiter = self._rate_limiter()
+        if limiter is not None:
+            limiter.acquire()
+        response = self.get_http_session().get(url, **kwargs)
+        if response.status_code == 304 and cached is not None:
+            return json_loads(cached[2])
+        response.raise_for_status()
+        data = json_loads(response.content)
+        if revalidate:
+            etag = response.headers.get("ETag")
+            last_modified = response.headers.get("Last-Modified")
+            if etag or last_modified:
+                self.validator_cache.set(key, (etag, last_modified, response.content))
+        return data
+
+    def is_package_installed(self, package_name: str) -> bool:
+        """Check if package is installed, once per process (packages don't disappear at runtime)."""
+        installed = _PACKAGES_INSTALLED.get(package_name)
+        if installed is None:
+            installed = _PACKAGES_INSTALLED[package_name] = super().is_package_installed(package_name)
+        return installed
+
+    @property
+    def package_status_str(self) -> str:
+        """Get status of packages, from a single pass over check_packages()."""
+        status = self.check_packages()
+        installed_count = sum(status.values())
+        if installed_count == len(status):
+            return "✓"
+        return f"{installed_count}/{len(status)}"
+
+    def _filter_config(self, config: dict[str, Any]) -> dict[str, Any]:
+        """Keep only the provider's config_keys (everything when it declares none)."""
+        keys = type(self).__dict__.get("_config_keys_set")
+        if keys is None:
+            keys = type(self)._config_keys_set = frozenset(self.config_keys)
+        if not keys:
+            return dict(config)
+        return {key: config[key] for key in keys & config.keys()}
+
+    def _get_config_or_env(self, key: str, default: Any = None) -> Any:
+        """Resolve a config key once (config, resolvers, environment, defaults) until the config changes."""
+        resolved = self.__dict__.setdefault("_resolved_config", {})
+        if key not in resolved:
+            resolved[key] = self._resolve_config(key)
+        value = resolved[key]
+        return default if value is None else value
+
+    def _resolve_config(self, key: str) -> Any:
+        """Look a config key up in config, resolvers, environment then config_defaults."""
+        value = getattr(self, "_config", {}).get(key)
+        if value is not None:
+            return value
+        provider_name = self.name
+        for resolver in self._config_resolvers:
+            value = resolver(provider_name, key)
+            if value is not None:
+                return value
+        for env_key in _env_keys(self.config_prefix, provider_name, key):
+            value = os.environ.get(env_key)
+            if value is not None:
+                return value
+        return self.config_defaults.get(key)
+
+    def clear_config_cache(self) -> None:
+        super().clear_config_cache()
+        self.__dict__.pop("_resolved_config", None)
+        self.__dict__.pop("_config_digest", None)
+
+    def _config_fingerprint(self) -> str:
+        """Digest of the resolved config, so cached lookups never cross configurations."""
+        digest = self.__dict__.get("_config_digest")
+        if digest is None:
+            keys = self.config_keys or sorted(getattr(self, "_config", {}))
+            resolved = repr([(key, self._get_config_or_env(key)) for key in keys])
+            digest = hashlib.sha256(resolved.encode()).hexdigest()[:16]
+            self.__dict__["_config_digest"] = digest
+        return digest
+
+    def _clean_reference(self, code: str) -> str:
+        """Normalize a reference code for cache keys."""
+        return code.strip()
+
+    @classmethod
+    def _compiled_fields(cls) -> dict[str, tuple[tuple[str, ...], ...]]:
+        """fields_associations string paths, split once per provider class."""
+        compiled = cls.__dict__.get("_compiled_fields_cache")
+        if compiled is None:
+            compiled = {}
+            for field, source in cls.fields_associations.items():
+                paths = (source,) if isinstance(source, str) else source
+                if isinstance(paths, (tuple, list)) and all(isinstance(path, str) for path in paths):
+                    compiled[field] = tuple(tuple(path.split(".")) for path in paths)
+            cls._compiled_fields_cache = compiled
+        return compiled
+
+    def _normalize_method(self, field: str) -> Callable[[Any], Any] | None:
+        """Bound get_normalize_{field} hook, or None; the class-level lookup is cached per field."""
+        name = f"get_normalize_{field}"
+        hook = self.__dict__.get(name)
+        if hook is None:
+            cls = type(self)
+            hooks = cls.__dict__.get("_normalize_hooks_cache")
+            if hooks is None:
+                hooks = {}
+                cls._normalize_hooks_cache = hooks
+            if field not in hooks:
+                hooks[field] = next((klass.__dict__[name] for klass in cls.__mro__ if name in klass.__dict__), None)
+            hook = hooks[field]
+            if hasattr(hook, "__get__"):
+                hook = hook.__get__(self, cls)
+        return hook if callable(hook) else None
+
+    def normalize_from_method_or_recursive(self, data: dict[str, Any], field: str, cfg: dict[str, Any]) -> Any:
+        return self._field_getter(field, cfg)(data)
+
+    def _field_getter(self, field: str, cfg: dict[str, Any]) -> Callable[[Any], Any]:
+        """How to read field from a result: its get_normalize_ hook, else its source path(s)."""
+        normalize_method = self._normalize_method(field)
+        if normalize_method is not None:
+            return normalize_method
+        paths = None if "source" in cfg else self._compiled_fields().get(field)
+        if paths is None:
+            source = cfg.get("source", self.fields_associations.get(field, field))
+            return lambda data: self._normalize_recursive(data, field, source)
+        return lambda data: _resolve_first(data, paths)
+
+    def _normalize_plan(self, fields: dict[str, Any]) -> list[tuple[str, Callable[[Any], Any]]]:
+        """(label, getter) pairs for a service's fields, built once per fields mapping."""
+        cached = self.__dict__.get("_normalize_plan_cache")
+        if cached is not None and cached[0] is fields:
+            return cached[1]
+        plan = []
+        for field, cfg in fields.items():
+            label = field if self.provider_key == "key" else cfg.get(self.provider_key, field)
+            plan.append((label, self._field_getter(field, cfg)))
+        self._normalize_plan_cache = (fields, plan)
+        return plan
+
+    def normalize(self, data: dict[str, Any], config: dict[str, Any] | None = None, raw: bool = True) -> dict[str, Any]:
+        """Normalize one result through the service's field plan, shared by every row of a batch."""
+        if config is None:
+            config = getattr(self, "config", {})
+        normalized = {label: getter(data) for label, getter in self._normalize_plan(config.get("fields", {}))}
+        normalized = self.insert_data_normalized(data, normalized, config)
+        if "raw" not in normalized and raw:
+            normalized["raw"] = data
+        return normalized
+
+    def normalize_columnar(self, results: list[Any], config: dict[str, Any] | None = None) -> dict[str, list[Any]]:
+        """Normalize a page of results into one list per field, ready for a DataFrame or Arrow table."""
+        if config is None:
+            config = getattr(self, "config", {})
+        plan = self._normalize_plan(config.get("fields", {}))
+        columns = {label: [getter(data) for data in results] for label, getter in plan}
+        insert_config = getattr(self, "services_cfg", {}).get(getattr(self, "current_service_name", None), config) or config
+        insert_fields = insert_config.get("fields", {}) if "fields" in insert_config else insert_config
+        rows: list[dict[str, Any]] | None = None
+        for field, field_cfg in insert_fields.items():
+            column = columns.get(field)
+            if column is None:
+                continue
+            for index, value in enumerate(column):
+                if value is None:
+                    if rows is None:
+                        rows = [dict(zip(columns, values)) for values in zip(*columns.values())]
+                    value = self.get_insert_data_value(results[index], rows[index], field, field_cfg)
+                    column[index] = rows[index][field] = value
+        return columns
+
+    def _get_nested_value(
+        self, data: dict[str, Any], path: str | list[str] | tuple[str, ...], default: Any = None
+    ) -> Any:
+        """First non-None value among dotted paths, through the same walker as fields_associations."""
+        for p in (path,) if isinstance(path, str) else path:
+            if p:
+                value = _walk_path(data, _split_path(p))
+                if value is not None:
+                    return value
+        return default
 
     @property
     def geo_data(self) -> str:
@@ -90,6 +429,7 @@ class CompanyAtlasProvider(ProviderBase):
             del self.services_cfg[command]['fields']['companyatlas_id']
             del self.services_cfg[command]['fields']['data_source']
             del self.services_cfg[command]['fields']['address_json']
+            self.__dict__.pop("_normalize_plan_cache", None)
         return super().response(*args, **kwargs)
 
 
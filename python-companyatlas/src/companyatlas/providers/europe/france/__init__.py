@@ -1,5 +1,5 @@
+from functools import lru_cache
 from typing import Any
-import re
 
 from .. import CompanyAtlasEuropeProvider
 
@@ -31,66 +31,160 @@ FRANCE_FIELDS_DESCRIPTIONS = {
     "longitude": "Longitude coordinate (float)",
 }
 
+# Same characters as the regex [\s-]: every Unicode whitespace code point (the last is
+# U+3000 IDEOGRAPHIC SPACE) plus the hyphen.
+_CLEAN_TABLE = dict.fromkeys([c for c in range(0x3001) if chr(c).isspace()] + [ord("-")])
+# Luhn doubling as a byte table: ASCII digit -> value of the doubled digit (2*d, minus 9 past 9).
+_LUHN_DOUBLED = bytes.maketrans(b"0123456789", bytes((0, 2, 4, 6, 8, 1, 3, 5, 7, 9)))
+
+
+# (doubled digit, kept digit) pair -> contribution to the Luhn sum, indexed by 10 * doubled + kept.
+_LUHN_PAIRS = tuple(doubled + kept for doubled in (0, 2, 4, 6, 8, 1, 3, 5, 7, 9) for kept in range(10))
+_ASCII_ZERO = ord("0")
+# Subtracted from 10 * byte + byte to index _LUHN_PAIRS straight from two ASCII digits.
+_LUHN_PAIR_OFFSET = 10 * _ASCII_ZERO + _ASCII_ZERO
+
+
+def _luhn_check(number: str) -> bool:
+    """Check the Luhn checksum of a string of ASCII digits."""
+    try:
+        digits = number.encode("ascii")
+    except UnicodeEncodeError:
+        return False
+    if not digits.isdigit():
+        return False
+    if len(digits) == 9:
+        # SIREN: the leading digit, then four (doubled, kept) pairs, unrolled.
+        pairs = _LUHN_PAIRS
+        offset = _LUHN_PAIR_OFFSET
+        total = (
+            digits[0] - _ASCII_ZERO
+            + pairs[10 * digits[1] + digits[2] - offset]
+            + pairs[10 * digits[3] + digits[4] - offset]
+            + pairs[10 * digits[5] + digits[6] - offset]
+            + pairs[10 * digits[7] + digits[8] - offset]
+        )
+        return total % 10 == 0
+    kept = digits[-1::-2]
+    doubled = digits[-2::-2].translate(_LUHN_DOUBLED)
+    return (sum(kept) - _ASCII_ZERO * len(kept) + sum(doubled)) % 10 == 0
+
+
+def _clean_siren(siren: str) -> str | None:
+    """The 9 digits of a SIREN once spaces and hyphens are removed, or None."""
+    if len(siren) == 9 and siren.isdecimal():
+        return siren
+    siren = siren.translate(_CLEAN_TABLE)
+    return siren if len(siren) == 9 and siren.isdecimal() else None
+
+
+def _is_rna(code: str) -> bool:
+    """Check a cleaned code is W (either case) followed by 8 digits."""
+    return len(code) == 9 and code[0] in "Ww" and code[1:].isdecimal()
+
+
+@lru_cache(maxsize=8192)
+def _detect_code(code: str) -> tuple[str | None, str]:
+    """Type (siren, siret, rna or None) and cleaned form of a code, cached per raw code."""
+    code_clean = code.translate(_CLEAN_TABLE)
+    if code_clean.isdecimal():
+        if len(code_clean) == 14:
+            return "siret", code_clean
+        if len(code_clean) == 9:
+            return "siren", code_clean
+    if _is_rna(code_clean):
+        return "rna", "W" + code_clean[1:]
+    return None, code_clean
+
+
 class CompanyAtlasFranceProvider(CompanyAtlasEuropeProvider):
     geo_code = "FR"
     geo_country = "france"
     abstract = True
-    france_fields = list(FRANCE_FIELDS_DESCRIPTIONS.keys())
+    france_fields = tuple(FRANCE_FIELDS_DESCRIPTIONS)
 
     def is_siret(self, query: str) -> bool:
         """Check if query is a SIRET number (14 digits)."""
         if not query:
             return False
-        siret_clean = re.sub(r"[\s-]", "", query)
-        return bool(re.match(r"^\d{14}$", siret_clean))
+        siret_clean = query.translate(_CLEAN_TABLE)
+        return len(siret_clean) == 14 and siret_clean.isdecimal()
 
     def is_siren(self, query: str) -> bool:
         """Check if query is a SIREN number (9 digits)."""
         if not query:
             return False
-        siren_clean = re.sub(r"[\s-]", "", query)
-        return bool(re.match(r"^\d{9}$", siren_clean))
+        siren_clean = query.translate(_CLEAN_TABLE)
+        return len(siren_clean) == 9 and siren_clean.isdecimal()
 
     def is_rna(self, query: str) -> bool:
         """Check if query is an RNA number (W + 8 digits)."""
         if not query:
             return False
-        rna_clean = re.sub(r"[\s-]", "", query.upper())
-        return bool(re.match(r"^W\d{8}$", rna_clean))
+        return _is_rna(query.translate(_CLEAN_TABLE))
+
+    def _luhn_check(self, number: str) -> bool:
+        """Check the Luhn checksum used by SIREN numbers."""
+        return _luhn_check(number)
 
     def _validate_siret(self, siret: str) -> bool:
-        siret_clean = re.sub(r"[\s-]", "", siret)
-        return bool(re.match(r"^\d{14}$", siret_clean))
+        siret_clean = siret.translate(_CLEAN_TABLE)
+        return len(siret_clean) == 14 and siret_clean.isdecimal()
 
     def _format_siret(self, siret: str) -> str:
-        siret_clean = re.sub(r"[\s-]", "", siret)
+        siret_clean = siret.translate(_CLEAN_TABLE)
         return siret_clean[:14] if len(siret_clean) >= 14 else siret_clean
 
     def _validate_siren(self, siren: str) -> bool:
-        siren_clean = re.sub(r"[\s-]", "", siren)
-        return bool(re.match(r"^\d{9}$", siren_clean))
+        siren_clean = _clean_siren(siren)
+        return siren_clean is not None and self._luhn_check(siren_clean)
+
+    def validate_sirens(self, sirens: list[str]) -> list[bool]:
+        """Validate many SIREN numbers at once (e.g. a CSV import), in input order."""
+        luhn_check = self._luhn_check
+        results = []
+        for siren in sirens:
+            siren_clean = _clean_siren(siren) if siren else None
+            results.append(siren_clean is not None and luhn_check(siren_clean))
+        return results
 
     def _format_siren(self, siren: str) -> str:
-        siren_clean = re.sub(r"[\s-]", "", siren)
+        if len(siren) == 9 and siren.isdecimal():
+            return siren
+        siren_clean = siren.translate(_CLEAN_TABLE)
         return siren_clean[:9] if len(siren_clean) >= 9 else siren_clean
 
+    def _siren_from_code(self, code: str) -> str | None:
+        """Clean, cut and validate a code in one pass: its SIREN (a SIRET yields its SIREN) or None."""
+        if not code:
+            return None
+        siren = code if len(code) == 9 else code.translate(_CLEAN_TABLE)[:9]
+        if len(siren) == 9 and siren.isdecimal() and self._luhn_check(siren):
+            return siren
+        return None
+
     def _validate_rna(self, rna: str) -> bool:
-        rna_clean = re.sub(r"[\s-]", "", rna.upper())
-        return bool(re.match(r"^W\d{8}$", rna_clean))
+        return _is_rna(rna.translate(_CLEAN_TABLE))
 
     def _format_rna(self, rna: str) -> str:
-        rna_clean = re.sub(r"[\s-]", "", rna.upper())
+        rna_clean = rna.upper().translate(_CLEAN_TABLE)
         return rna_clean[:9] if len(rna_clean) >= 9 else rna_clean
 
+    def _join_street(self, *parts: Any) -> str | None:
+        """Join the non-empty street parts (number, type, name) into one address line."""
+        street = [str(part) for part in parts if part]
+        return " ".join(street) if street else None
+
+    def _detect_code(self, code: str) -> tuple[str | None, str]:
+        """Detect the type of code (siren, siret, rna) and return it with the cleaned code."""
+        return _detect_code(code)
+
     def _detect_code_type(self, code: str) -> str | None:
         """Detect the type of code (siren, siret, rna)."""
-        if self.is_siret(code):
-            return "siret"
-        if self.is_siren(code):
-            return "siren"
-        if self.is_rna(code):
-            return "rna"
-        return None
+        return self._detect_code(code)[0]
+
+    def _clean_reference(self, code: str) -> str:
+        return code.translate(_CLEAN_TABLE).upper()
 
     def get_normalize_source_field(self, data: dict[str, Any]) -> str | None:
         """Get the source field for a code (siren, siret, rna)."""
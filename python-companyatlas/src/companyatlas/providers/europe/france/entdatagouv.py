@@ -1,6 +1,6 @@
-import re
 from typing import Any, cast
-from urllib.parse import quote
+
+from companyatlas.cache import cached_reference
 
 from . import CompanyAtlasFranceProvider
 
@@ -18,6 +18,8 @@ class EntdatagouvProvider(CompanyAtlasFranceProvider):
     site_url = "https://www.data.gouv.fr"
     status_url = None
     priority = 2
+    rate_limit = (7, 1)
+    max_search_limit = 25
 
     fields_associations = {
         "denomination": ["nom_raison_sociale", "nom_complet"],
@@ -36,30 +38,35 @@ class EntdatagouvProvider(CompanyAtlasFranceProvider):
         ),
     }
 
-    def _call_api(self, url: str) -> dict[str, Any]:
-        response = requests.get(url, timeout=10)  # type: ignore[name-defined]
-        response.raise_for_status()
-        return cast('dict[str, Any]', response.json())
+    _REFERENCE_PATHS = {
+        "siren": "/search?per_page=1&q=",
+        "siret": "/search?per_page=1&q=",
+        "rna": "/api/rna/v1/id/",
+    }
 
-    def get_normalize_address_line1(self, data: dict[str, Any]) -> str | None:
-        nv = self._get_nested_value(data, ["siege.numero_voie", "matching_etablissements.0.numero_voie"])
-        tv = self._get_nested_value(data, ["siege.type_voie", "matching_etablissements.0.type_voie"])
-        lv = self._get_nested_value(data, ["siege.libelle_voie", "matching_etablissements.0.libelle_voie"])
-        parts = [p for p in [nv, tv, lv] if p]
-        return " ".join(str(p) for p in parts) if parts else None
+    def _call_api(self, url: str, params: dict[str, Any] | None = None, revalidate: bool = False) -> dict[str, Any]:
+        return cast('dict[str, Any]', self._get_json(url, revalidate=revalidate, params=params))
 
-    def get_normalize_address_json(self, data: dict[str, Any]) -> dict[str, Any] | None:
-        nv = self._get_nested_value(data, ["siege.numero_voie", "matching_etablissements.0.numero_voie"])
-        tv = self._get_nested_value(data, ["siege.type_voie", "matching_etablissements.0.type_voie"])
-        lv = self._get_nested_value(data, ["siege.libelle_voie", "matching_etablissements.0.libelle_voie"])
-        address_parts = [p for p in [nv, tv, lv] if p]
-        address_line1 = " ".join(str(p) for p in address_parts) if address_parts else None
+    def _address_fields(self, data: dict[str, Any]) -> tuple[str | None, Any, Any]:
+        """Street line, postal code and city of the head office (or first matching establishment)."""
+        address_line1 = self._join_street(
+            self._get_nested_value(data, ["siege.numero_voie", "matching_etablissements.0.numero_voie"]),
+            self._get_nested_value(data, ["siege.type_voie", "matching_etablissements.0.type_voie"]),
+            self._get_nested_value(data, ["siege.libelle_voie", "matching_etablissements.0.libelle_voie"]),
+        )
         postal_code = self._get_nested_value(
             data, ["siege.code_postal", "matching_etablissements.0.code_postal"]
         )
         city = self._get_nested_value(
             data, ["siege.libelle_commune", "matching_etablissements.0.libelle_commune"]
         )
+        return address_line1, postal_code, city
+
+    def get_normalize_address_line1(self, data: dict[str, Any]) -> str | None:
+        return self._address_fields(data)[0]
+
+    def get_normalize_address_json(self, data: dict[str, Any]) -> dict[str, Any] | None:
+        address_line1, postal_code, city = self._address_fields(data)
         if not address_line1 and not postal_code and not city:
             return None
         return {
@@ -72,50 +79,36 @@ class EntdatagouvProvider(CompanyAtlasFranceProvider):
 
     def get_normalize_address(self, data: dict[str, Any]) -> str | None:
         """Build full address from multiple fields."""
+        address_line1, postal_code, city = self._address_fields(data)
         parts = []
-        nv = self._get_nested_value(data, ["siege.numero_voie", "matching_etablissements.0.numero_voie"])
-        tv = self._get_nested_value(data, ["siege.type_voie", "matching_etablissements.0.type_voie"])
-        lv = self._get_nested_value(data, ["siege.libelle_voie", "matching_etablissements.0.libelle_voie"])
-        cp = self._get_nested_value(data, ["siege.code_postal", "matching_etablissements.0.code_postal"])
-        city = self._get_nested_value(
-            data, ["siege.libelle_commune", "matching_etablissements.0.libelle_commune"]
-        )
-        address_line = []
-        if nv:
-            address_line.append(str(nv))
-        if tv:
-            address_line.append(tv)
-        if lv:
-            address_line.append(lv)
-        if address_line:
-            parts.append(" ".join(address_line))
-        if cp:
-            parts.append(str(cp))
+        if address_line1:
+            parts.append(address_line1)
+        if postal_code:
+            parts.append(str(postal_code))
         if city:
             parts.append(city)
         return ", ".join(parts) if parts else None
 
-    def search_company(self, query: str, raw: bool = False, **kwargs: Any) -> list[dict[str, Any]]:
+    def search_company(self, query: str, raw: bool = False, limit: int = 20, **kwargs: Any) -> list[dict[str, Any]]:
         """Search for a company by name."""
         if not query:
             return []
-        url = f"{self._get_config_or_env('BASE_URL')}/search?q={quote(query)}"
-        data = self._call_api(url)
+        data = self._call_api(
+            self._get_config_or_env("BASE_URL") + "/search", params={"q": query, "per_page": self._search_limit(limit)}
+        )
         results = data.get("results", [])
         return cast('list[dict[str, Any]]', results)
 
     def _get_url_by_reference(self, code: str) -> str | None:
         """Get the URL to search for a company by reference."""
-        code_type = self._detect_code_type(code)
-        if not code_type:
+        code_type, code_clean = self._detect_code(code)
+        path = self._REFERENCE_PATHS.get(code_type) if code_type else None
+        if path is None:
             return None
-        code_clean = re.sub(r"[\s-]", "", code)
-        if code_type == "siren" or code_type == "siret":
-            return f"{self._get_config_or_env('BASE_URL')}/search?q={code_clean}"
-        elif code_type == "rna":
-            return f"{self._get_config_or_env('BASE_URL')}/api/rna/v1/id/{code_clean}"
-        return None
+        # Detected codes are digits (or W + digits), so no quote() pass is needed.
+        return self._get_config_or_env("BASE_URL") + path + code_clean
 
+    @cached_reference
     def search_company_by_reference(self, code: str, raw: bool = False, **kwargs: Any) -> dict[str, Any] | None:
         """Search for a company by SIREN, SIRET, or RNA."""
         if not code:
@@ -123,7 +116,7 @@ class EntdatagouvProvider(CompanyAtlasFranceProvider):
         url = self._get_url_by_reference(code)
         if url is None:
             return None
-        data = self._call_api(url)
+        data = self._call_api(url, revalidate=True)
         results = data.get("results", [])
         return results[0] if results else None
 
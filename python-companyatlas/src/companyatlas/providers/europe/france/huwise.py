@@ -1,5 +1,7 @@
 from typing import Any, cast
 
+from companyatlas.cache import cached_reference
+
 from . import CompanyAtlasFranceProvider
 
 
@@ -16,6 +18,7 @@ class HuwiseProvider(CompanyAtlasFranceProvider):
     documentation_url = "https://docs.huwise.com"
     site_url = "https://huwise.com"
     status_url = None
+    max_search_limit = 100
     priority = 3
 
     fields_associations = {
@@ -30,14 +33,17 @@ class HuwiseProvider(CompanyAtlasFranceProvider):
         ),
     }
 
+    def _address_fields(self, data: dict[str, Any]) -> tuple[str | None, Any, Any]:
+        """Street line, postal code and city of the establishment record."""
+        address_line1 = self._join_street(
+            data.get("numerovoieetablissement"),
+            data.get("typevoieetablissement"),
+            data.get("libellevoieetablissement"),
+        )
+        return address_line1, data.get("codepostaletablissement"), data.get("libellecommuneetablissement")
+
     def get_normalize_address_json(self, data: dict[str, Any]) -> dict[str, Any] | None:
-        numero = self._get_nested_value(data, "numerovoieetablissement")
-        type_voie = self._get_nested_value(data, "typevoieetablissement")
-        libelle = self._get_nested_value(data, "libellevoieetablissement")
-        address_parts = [p for p in [numero, type_voie, libelle] if p]
-        address_line1 = " ".join(str(p) for p in address_parts) if address_parts else None
-        postal_code = self._get_nested_value(data, "codepostaletablissement")
-        city = self._get_nested_value(data, "libellecommuneetablissement")
+        address_line1, postal_code, city = self._address_fields(data)
         if not address_line1 and not postal_code and not city:
             return None
         return {
@@ -50,56 +56,40 @@ class HuwiseProvider(CompanyAtlasFranceProvider):
 
     def get_normalize_address(self, data: dict[str, Any]) -> str | None:
         """Build full address from multiple fields."""
+        address_line1, postal_code, city = self._address_fields(data)
         parts = []
-        numero = self._get_nested_value(data, "numerovoieetablissement")
-        type_voie = self._get_nested_value(data, "typevoieetablissement")
-        libelle = self._get_nested_value(data, "libellevoieetablissement")
-        code_postal = self._get_nested_value(data, "codepostaletablissement")
-        commune = self._get_nested_value(data, "libellecommuneetablissement")
-        address_line = []
-        if numero:
-            address_line.append(str(numero))
-        if type_voie:
-            address_line.append(type_voie)
-        if libelle:
-            address_line.append(libelle)
-        if address_line:
-            parts.append(" ".join(address_line))
-        if code_postal:
-            parts.append(str(code_postal))
-        if commune:
-            parts.append(commune)
+        if address_line1:
+            parts.append(address_line1)
+        if postal_code:
+            parts.append(str(postal_code))
+        if city:
+            parts.append(city)
         return ", ".join(parts) if parts else None
 
-    def _call_api(self, query: str) -> dict[str, Any]:
+    def _call_api(self, query: str, limit: int = 20, revalidate: bool = False) -> dict[str, Any]:
         dataset_id = self._get_config_or_env("SIREN_DATASET_ID", default="economicref-france-sirene-v3")
         base_url = self._get_config_or_env("BASE_URL", default="https://hub.huwise.com")
         url = f"{base_url}/api/explore/v2.1/catalog/datasets/{dataset_id}/records/"
-        params = {"where": f"search({query})", "limit": 20, "lang": "fr", "offset": 0, "timezone": "Europe/Paris"}
-        headers: dict[str, str] = {}
-        response = requests.get(url, params=params, headers=headers, timeout=10)  # type: ignore[name-defined]
-        response.raise_for_status()
-        return cast('dict[str, Any]', response.json())
+        params = {"where": f"search({query})", "limit": limit, "lang": "fr", "offset": 0, "timezone": "Europe/Paris"}
+        return cast('dict[str, Any]', self._get_json(url, revalidate=revalidate, params=params))
 
-    def search_company(self, query: str, raw: bool = False, **kwargs: Any) -> list[dict[str, Any]]:
+    def search_company(self, query: str, raw: bool = False, limit: int = 20, **kwargs: Any) -> list[dict[str, Any]]:
         """Search for a company by name."""
         if not query:
             return []
         query_str = f'"{query}"'
-        data = self._call_api(query_str)
+        data = self._call_api(query_str, limit=self._search_limit(limit))
         results = data.get("results", [])
         return cast('list[dict[str, Any]]', results)
 
+    @cached_reference
     def search_company_by_reference(self, code: str, raw: bool = False, **kwargs: Any) -> dict[str, Any] | None:
         """Search for a company by SIREN."""
-        if not code:
-            return None
-
-        siren = self._format_siren(code)
-        if not self._validate_siren(siren):
+        siren = self._siren_from_code(code)
+        if siren is None:
             return None
         query_str = f'"{siren}"'
-        data = self._call_api(query_str)
+        data = self._call_api(query_str, limit=1, revalidate=True)
         results = data.get("results", [])
         return results[0] if results else None
 
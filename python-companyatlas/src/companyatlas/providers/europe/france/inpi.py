@@ -1,5 +1,9 @@
+from types import MappingProxyType
 from typing import Any, cast
 
+from companyatlas.cache import cached_reference
+from companyatlas.providers import json_loads
+
 from . import CompanyAtlasFranceProvider
 
 
@@ -16,11 +20,10 @@ class InpiProvider(CompanyAtlasFranceProvider):
     documentation_url = "https://www.inpi.fr/fr/services-et-outils/api"
     site_url = "https://www.inpi.fr"
     status_url = None
+    max_search_limit = 100
     priority = 5
-
-    def __init__(self, **kwargs: Any):
-        super().__init__(**kwargs)
-        self._token: str | None = None
+    _token: str | None = None
+    _headers: MappingProxyType[str, str] | None = None
 
     # Address prefixes to search in order of priority
     _address_prefixes = (
@@ -42,11 +45,15 @@ class InpiProvider(CompanyAtlasFranceProvider):
         "denomination": (
             "formality.content.personnePhysique.etablissementPrincipal.descriptionEtablissement.nomCommercial",
             "formality.content.personneMorale.identite.entreprise.denomination",
-            "formality.content.personnePhysique.etablissementPrincipal.descriptionEtablissement.nomCommercial",
             "formality.content.personnePhysique.identite.entreprise.denomination",
         ),
     }
 
+    def clear_config_cache(self) -> None:
+        super().clear_config_cache()
+        self._token = None
+        self._headers = None
+
     def _get_token(self) -> str | None:
         """Get authentication token from INPI API."""
         if self._token:
@@ -56,37 +63,41 @@ class InpiProvider(CompanyAtlasFranceProvider):
         if not username or not password:
             return None
         try:
-            response = requests.post(  # type: ignore[name-defined]
+            response = self.get_http_session().post(
                 self._get_config_or_env("SSO_URL"),
                 json={"username": username, "password": password},
                 headers={"Content-Type": "application/json"},
-                timeout=10,
+                timeout=self.http_timeout,
             )
             response.raise_for_status()
-            data = response.json()
+            data = json_loads(response.content)
             self._token = data.get("token") or data.get("access_token")
             return self._token
         except Exception:
             return None
 
-    def _call_api(self, url: str, params: dict[str, Any] | None = None) -> dict[str, Any] | list[dict[str, Any]] | None:
+    def _call_api(
+        self, url: str, params: dict[str, Any] | None = None, revalidate: bool = False
+    ) -> dict[str, Any] | list[dict[str, Any]] | None:
         """Make authenticated API call."""
-        token = self._get_token()
-        if not token:
-            return None
-        headers = {"Authorization": f"Bearer {token}", "Accept": "application/json"}
-        response = requests.get(url, headers=headers, params=params, timeout=10)  # type: ignore[name-defined]
-        response.raise_for_status()
-        return cast('dict[str, Any] | list[dict[str, Any]]', response.json())
+        if self._headers is None:
+            token = self._get_token()
+            if not token:
+                return None
+            self._headers = MappingProxyType({"Authorization": f"Bearer {token}", "Accept": "application/json"})
+        return cast(
+            'dict[str, Any] | list[dict[str, Any]]',
+            self._get_json(url, revalidate=revalidate, headers=self._headers, params=params),
+        )
 
 
-    def search_company(self, query: str, raw: bool = False, **kwargs: Any) -> list[dict[str, Any]]:
+    def search_company(self, query: str, raw: bool = False, limit: int = 20, **kwargs: Any) -> list[dict[str, Any]]:
         """Search for a company by name."""
         if not query:
             return []
         result = self._call_api(
             f"{self._get_config_or_env('BASE_URL')}/api/companies",
-            params={"companyName": query, "page": 1, "pageSize": 20},
+            params={"companyName": query, "page": 1, "pageSize": self._search_limit(limit)},
         )
         if not result:
             return []
@@ -95,14 +106,13 @@ class InpiProvider(CompanyAtlasFranceProvider):
         elif isinstance(result, list):
             return result
 
+    @cached_reference
     def search_company_by_reference(self, code: str, raw: bool = False, **kwargs: Any) -> dict[str, Any] | None:
         """Search for a company by SIREN."""
-        if not code:
-            return None
-        siren = self._format_siren(code)
-        if not self._validate_siren(siren):
+        siren = self._siren_from_code(code)
+        if siren is None:
             return None
-        return self._call_api(f"{self._get_config_or_env('BASE_URL')}/api/companies/{siren}")
+        return self._call_api(f"{self._get_config_or_env('BASE_URL')}/api/companies/{siren}", revalidate=True)
 
     def get_normalize_address(self, data: dict[str, Any]) -> str | None:
         """Build full address from multiple fields."""
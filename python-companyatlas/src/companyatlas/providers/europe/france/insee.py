@@ -1,20 +1,33 @@
-import re
+from functools import cached_property
+from types import MappingProxyType
 from typing import Any, cast
 from urllib.parse import quote, urlencode
 
+from companyatlas.cache import cached_reference
+
 from . import CompanyAtlasFranceProvider
 
 
+def _quote_query(value: str, safe: str = "", encoding: str | None = None, errors: str | None = None) -> str:
+    """quote() that keeps ``+`` literal, as SIRENE uses it to join query clauses."""
+    return quote(value, safe="+", encoding=encoding, errors=errors)
+
+
 class InseeProvider(CompanyAtlasFranceProvider):
     name = "insee"
     display_name = "INSEE SIRENE"
     description = "Official French company registry (SIRENE database)"
     required_packages = ["requests"]
-    config_keys = ["API_KEY"]
+    config_keys = ["API_KEY", "BASE_URL"]
+    config_defaults = {
+        "BASE_URL": "https://api.insee.fr/api-sirene/3.11",
+    }
     documentation_url = "https://api.insee.fr/catalogue/site/themes/wso2/subthemes/insee/pages/list-apis.jag"
     site_url = "https://www.insee.fr"
     status_url = "https://api.insee.fr/status"
     priority = 4
+    rate_limit = (0.5, 1)
+    max_search_limit = 1000
 
     fields_associations = {
         "denomination": "uniteLegale.denominationUniteLegale",
@@ -28,39 +41,62 @@ class InseeProvider(CompanyAtlasFranceProvider):
         ),
     }
 
+    # SIRENE variables sent as ``champs`` so the API returns only these instead of full
+    # establishment records. Off by default: it also trims the ``raw`` and ``data_source``
+    # output. Set it to SIRENE_MAPPED_FIELDS to fetch just what normalization reads.
+    projected_fields: tuple[str, ...] | None = None
+
+    SIRENE_MAPPED_FIELDS = (
+        "siren",
+        "siret",
+        "denominationUniteLegale",
+        "identifiantAssociationUniteLegale",
+        "numeroVoieEtablissement",
+        "typeVoieEtablissement",
+        "libelleVoieEtablissement",
+        "codePostalEtablissement",
+        "libelleCommuneEtablissement",
+        "libellePaysEtrangerEtablissement",
+    )
+
+    _QUERY_BUILDERS = {
+        "siren": "siren:{code}+AND+etatAdministratifUniteLegale:A+AND+etablissementSiege:true",
+        "siret": "siret:{code}+AND+etatAdministratifUniteLegale:A+AND+etablissementSiege:true",
+        "rna": "identifiantAssociationUniteLegale:{code}+AND+etablissementSiege:true+AND+etatAdministratifUniteLegale:A",
+    }
+
+    def _address_fields(self, data: dict[str, Any]) -> tuple[str | None, Any, Any, Any]:
+        """Street line, postal code, city and country of the establishment address."""
+        address = data.get("adresseEtablissement") or {}
+        address_line1 = self._join_street(
+            address.get("numeroVoieEtablissement"),
+            address.get("typeVoieEtablissement"),
+            address.get("libelleVoieEtablissement"),
+        )
+        return (
+            address_line1,
+            address.get("codePostalEtablissement"),
+            address.get("libelleCommuneEtablissement"),
+            address.get("libellePaysEtrangerEtablissement"),
+        )
+
     def get_normalize_address_json(self, data: dict[str, Any]) -> dict[str, Any] | None:
-        number = self._get_nested_value(data, "adresseEtablissement.numeroVoieEtablissement")
-        street_type = self._get_nested_value(data, "adresseEtablissement.typeVoieEtablissement")
-        street_name = self._get_nested_value(data, "adresseEtablissement.libelleVoieEtablissement")
-        address_parts = [part for part in [number, street_type, street_name] if part]
+        address_line1, postal_code, city, country = self._address_fields(data)
         return {
-            "address_line1": " ".join(address_parts) if address_parts else None,
-            "postal_code": self._get_nested_value(data, "adresseEtablissement.codePostalEtablissement"),
-            "city": self._get_nested_value(data, "adresseEtablissement.libelleCommuneEtablissement"),
-            "country": self._get_nested_value(data, "adresseEtablissement.libellePaysEtablissement", self.geo_country),
-            "country_code": self._get_nested_value(data, "adresseEtablissement.libellePaysEtablissement", self.geo_code),
+            "address_line1": address_line1,
+            "postal_code": postal_code,
+            "city": city,
+            "country": country or self.geo_country,
+            "country_code": self.geo_code,
         }
 
-
     def get_normalize_address(self, data: dict[str, Any]) -> str | None:
         """Build full address from multiple fields."""
+        address_line1, postal_code, city, country = self._address_fields(data)
+        country = country or self.geo_country
         parts = []
-        number = self._get_nested_value(data, "adresseEtablissement.numeroVoieEtablissement")
-        street_type = self._get_nested_value(data, "adresseEtablissement.typeVoieEtablissement")
-        street_name = self._get_nested_value(data, "adresseEtablissement.libelleVoieEtablissement")
-        postal_code = self._get_nested_value(data, "adresseEtablissement.codePostalEtablissement")
-        city = self._get_nested_value(data, "adresseEtablissement.libelleCommuneEtablissement")
-        country = self._get_nested_value(data, "adresseEtablissement.libellePaysEtablissement", self.geo_country)
-        
-        address_line = []
-        if number:
-            address_line.append(str(number))
-        if street_type:
-            address_line.append(street_type)
-        if street_name:
-            address_line.append(street_name)
-        if address_line:
-            parts.append(" ".join(address_line))
+        if address_line1:
+            parts.append(address_line1)
         if postal_code:
             parts.append(str(postal_code))
         if city:
@@ -69,35 +105,32 @@ class InseeProvider(CompanyAtlasFranceProvider):
             parts.append(country)
         return ", ".join(parts) if parts else None
 
-    def _detect_code_type(self, code: str) -> str | None:
-        code_clean = re.sub(r"[\s-]", "", code)
-        if re.match(r"^\d{9}$", code_clean):
-            return "siren"
-        if re.match(r"^\d{14}$", code_clean):
-            return "siret"
-        rna_clean = re.sub(r"[\s-]", "", code.upper())
-        if re.match(r"^W\d{8}$", rna_clean):
-            return "rna"
-        return None
-
-    def _call_api(self, query: str, endpoint: str = "siret") -> list[dict[str, Any]]:
+    @cached_property
+    def _headers(self) -> MappingProxyType[str, str]:
         api_key = self._get_config_or_env("API_KEY")
         if not api_key:
             raise ValueError("INSEE API_KEY is required but not configured")
+        return MappingProxyType({"Accept": "application/json", "X-INSEE-Api-Key-Integration": api_key})
+
+    def clear_config_cache(self) -> None:
+        super().clear_config_cache()
+        self.__dict__.pop("_headers", None)
+
+    def _call_api(
+        self, query: str, endpoint: str = "siret", nombre: int = 20, revalidate: bool = False
+    ) -> list[dict[str, Any]]:
+        headers = self._headers
         query_params = {
             "q": query,
-            "nombre": 20,
+            "nombre": nombre,
             "debut": 0,
             "masquerValeursNulles": "true",
         }
-        query_string = urlencode(
-            query_params, quote_via=lambda s, safe="", encoding=None, errors=None: quote(s, safe="+", encoding=encoding, errors=errors)
-        )
-        url = f"https://api.insee.fr/api-sirene/3.11/{endpoint}?{query_string}"
-        headers = {"Accept": "application/json", "X-INSEE-Api-Key-Integration": api_key}
-        response = requests.get(url, headers=headers, timeout=10)  # type: ignore[name-defined]
-        response.raise_for_status()
-        data = response.json()
+        if self.projected_fields:
+            query_params["champs"] = ",".join(self.projected_fields)
+        query_string = urlencode(query_params, quote_via=_quote_query)
+        url = f"{self._get_config_or_env('BASE_URL')}/{endpoint}?{query_string}"
+        data = self._get_json(url, revalidate=revalidate, headers=headers)
         if "etablissements" in data:
             return cast('list[dict[str, Any]]', data["etablissements"])
         if "unitesLegales" in data:
@@ -105,29 +138,23 @@ class InseeProvider(CompanyAtlasFranceProvider):
         return []
 
 
-    def search_company(self, query: str, raw: bool = False, **kwargs: Any) -> list[dict[str, Any]]:
+    def search_company(self, query: str, raw: bool = False, limit: int = 20, **kwargs: Any) -> list[dict[str, Any]]:
         """Search for a company by name."""
         if not query:
             return []
         query_clean = query.replace("+", " ").strip()
         query_str = f'denominationUniteLegale:"{query_clean}"'
-        return self._call_api(query_str, endpoint="siret")
+        return self._call_api(query_str, endpoint="siret", nombre=self._search_limit(limit))
 
 
+    @cached_reference
     def search_company_by_reference(self, code: str, raw: bool = False, **kwargs: Any) -> dict[str, Any] | None:
         """Search for a company by SIREN, SIRET, or RNA."""
         if not code:
             return None
-        code_type = self._detect_code_type(code)
-        if not code_type:
+        code_type, code_clean = self._detect_code(code)
+        if code_type is None:
             return None
-        code_clean = re.sub(r"[\s-]", "", code)
-        if code_type == "siren":
-            query_str = f"siren:{code_clean}+AND+etatAdministratifUniteLegale:A+AND+etablissementSiege:true"
-        elif code_type == "siret":
-            query_str = f"siret:{code_clean}+AND+etatAdministratifUniteLegale:A+AND+etablissementSiege:true"
-        else:
-            rna_clean = re.sub(r"[\s-]", "", code.upper())
-            query_str = f"identifiantAssociationUniteLegale:{rna_clean}+AND+etablissementSiege:true+AND+etatAdministratifUniteLegale:A"
-        results = self._call_api(query_str)
+        query_str = self._QUERY_BUILDERS[code_type].format(code=code_clean)
+        results = self._call_api(query_str, nombre=1, revalidate=True)
         return results[0] if results else None
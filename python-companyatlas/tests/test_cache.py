@@ -0,0 +1,149 @@
+"""Tests for provider lookup caching."""
+
+from companyatlas.cache import ExpiringStore, TTLCache, cached_reference
+
+
+class FakeProvider:
+    """Minimal provider exposing what cached_reference relies on."""
+
+    name = "fake"
+
+    def __init__(self):
+        self.reference_cache = TTLCache()
+        self.calls = 0
+
+    def _clean_reference(self, code):
+        return code.replace(" ", "")
+
+    def _config_fingerprint(self):
+        return ""
+
+    @cached_reference
+    def search_company_by_reference(self, code, raw=False, **kwargs):
+        self.calls += 1
+        return {"siren": code, "raw": raw}
+
+
+def test_repeat_lookup_is_cached():
+    """The same code, spaced or not, reaches the provider once."""
+    provider = FakeProvider()
+    provider.search_company_by_reference("552 100 554")
+    provider.search_company_by_reference("552100554")
+    assert provider.calls == 1
+
+
+def test_routing_kwargs_do_not_bypass_cache():
+    """Unhashable routing kwargs such as attribute_search are left out of the key."""
+    provider = FakeProvider()
+    for _ in range(3):
+        provider.search_company_by_reference("552100554", attribute_search={"name": "fake"})
+    assert provider.calls == 1
+
+
+def test_raw_is_part_of_key():
+    """raw, given by keyword or position, gets its own entry."""
+    provider = FakeProvider()
+    provider.search_company_by_reference("552100554")
+    provider.search_company_by_reference("552100554", raw=True)
+    provider.search_company_by_reference("552100554", True)
+    assert provider.calls == 2
+
+
+def test_results_are_copies():
+    """Mutating a returned result never alters the cached one."""
+    provider = FakeProvider()
+    first = provider.search_company_by_reference("552100554")
+    first["siren"] = "mutated"
+    second = provider.search_company_by_reference("552100554")
+    assert second["siren"] == "552100554"
+    assert first is not second
+
+
+def test_not_found_is_cached():
+    """An HTTP 404 is cached as None instead of being raised."""
+
+    class Response:
+        status_code = 404
+
+    class HTTPError(Exception):
+        response = Response()
+
+    class MissingProvider(FakeProvider):
+        @cached_reference
+        def search_company_by_reference(self, code, raw=False, **kwargs):
+            self.calls += 1
+            raise HTTPError()
+
+    provider = MissingProvider()
+    assert provider.search_company_by_reference("552100554") is None
+    assert provider.search_company_by_reference("552100554") is None
+    assert provider.calls == 1
+
+
+def test_ttl_expiry(monkeypatch):
+    """Found results and None expire after their own TTLs, counted as hits and misses."""
+    now = [100.0]
+    monkeypatch.setattr("companyatlas.cache.time.monotonic", lambda: now[0])
+    cache = TTLCache(ttl=10, negative_ttl=1)
+    cache.set("hit", {"a": 1})
+    cache.set("miss", None)
+    now[0] += 2
+    assert cache.get("hit") == {"a": 1}
+    assert cache.get("miss", "gone") == "gone"
+    now[0] += 10
+    assert cache.get("hit", "gone") == "gone"
+    assert (cache.hits, cache.misses) == (1, 2)
+
+
+def test_lru_eviction():
+    """The least recently used entry goes first once maxsize is reached."""
+    cache = TTLCache(maxsize=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+    assert cache.get("b", None) is None
+    assert cache.get("a") == 1
+    assert len(cache) == 2
+
+
+def test_expiring_store_passes_ttls():
+    """ExpiringStore hands found and not-found results their own expiry."""
+
+    class Store(dict):
+        def set(self, key, value, expire=None):
+            self[key] = (value, expire)
+
+    store = ExpiringStore(Store(), ttl=3600, negative_ttl=60)
+    store.set("found", {"a": 1})
+    store.set("missing", None)
+    assert store.store == {"found": ({"a": 1}, 3600), "missing": (None, 60)}
+    assert store.get("found") == ({"a": 1}, 3600)
+    assert store.get("other", "gone") == "gone"
+
+
+def test_configs_do_not_share_entries(monkeypatch):
+    """Instances with another BASE_URL never see each other's cached lookups."""
+    from companyatlas.providers.europe.france.entdatagouv import EntdatagouvProvider
+
+    monkeypatch.setattr(EntdatagouvProvider, "reference_cache", TTLCache())
+    first = EntdatagouvProvider(config={"BASE_URL": "https://a.test"})
+    first._call_api = lambda url, **kwargs: {"results": []}
+    second = EntdatagouvProvider(config={"BASE_URL": "https://b.test"})
+    second._call_api = lambda url, **kwargs: {"results": [{"siren": "552100554"}]}
+    assert first.search_company_by_reference("552100554") is None
+    assert second.search_company_by_reference("552100554") == {"siren": "552100554"}
+
+
+def test_configure_changes_key(monkeypatch):
+    """Reconfiguring an instance stops it serving lookups made under the old config."""
+    from companyatlas.providers.europe.france.entdatagouv import EntdatagouvProvider
+
+    monkeypatch.setattr(EntdatagouvProvider, "reference_cache", TTLCache())
+    responses = [{"results": []}, {"results": [{"siren": "552100554"}]}]
+    provider = EntdatagouvProvider()
+    provider._call_api = lambda url, **kwargs: responses.pop(0)
+    assert provider.search_company_by_reference("552100554") is None
+    assert provider.search_company_by_reference("552100554") is None
+    provider.configure({"BASE_URL": "https://example.test"})
+    assert provider.search_company_by_reference("552100554") == {"siren": "552100554"}
@@ -0,0 +1,75 @@
+"""Tests for French reference code detection."""
+
+import re
+import sys
+
+import pytest
+
+from companyatlas.providers.europe.france import _CLEAN_TABLE, _detect_code, _luhn_check
+from companyatlas.providers.europe.france.entdatagouv import EntdatagouvProvider
+
+
+def test_clean_table_matches_whitespace_and_hyphen():
+    """The translate table drops exactly what the regex [\\s-] matched."""
+    expected = {c for c in range(sys.maxunicode + 1) if re.fullmatch(r"[\s-]", chr(c))}
+    assert set(_CLEAN_TABLE) == expected
+
+
+@pytest.mark.parametrize("separator", [" ", "-", "\xa0", "\u2009", "\u202f", "\u3000", "\x85", "\u2028", "\x1c"])
+def test_detect_siren_with_separators(separator):
+    """A SIREN split by any whitespace or a hyphen is still detected."""
+    assert _detect_code(separator.join(("552", "100", "554"))) == ("siren", "552100554")
+
+
+def reference_luhn(number):
+    """Textbook Luhn: double every second digit from the right."""
+    total = 0
+    for position, digit in enumerate(int(c) for c in reversed(number)):
+        if position % 2:
+            digit = digit * 2 - 9 if digit > 4 else digit * 2
+        total += digit
+    return total % 10 == 0
+
+
+@pytest.mark.parametrize("number", ["552100554", "356000000", "732829320", "552100555", "356000001", "000000000"])
+def test_luhn_matches_reference_on_sirens(number):
+    """The unrolled nine-digit path agrees with the textbook algorithm."""
+    assert _luhn_check(number) is reference_luhn(number)
+
+
+def test_luhn_known_sirens():
+    """Real SIRENs pass and a one-digit typo fails."""
+    assert _luhn_check("552100554")
+    assert _luhn_check("356000000")
+    assert not _luhn_check("552100545")
+
+
+@pytest.mark.parametrize("number", ["55210055400029", "35600000000048", "35600000000049", "4", "18", "79927398713"])
+def test_luhn_matches_reference_on_other_lengths(number):
+    """The general path (SIRET, any length) agrees with the textbook algorithm."""
+    assert _luhn_check(number) is reference_luhn(number)
+
+
+def test_luhn_rejects_non_digits():
+    """Letters and non-ASCII digits are never valid."""
+    assert not _luhn_check("55210055a")
+    assert not _luhn_check("552100554x")
+    assert not _luhn_check("٥٥٢١٠٠٥٥٤")
+
+
+def test_siren_from_code():
+    """SIRENs and SIRETs yield their valid SIREN; anything else yields None."""
+    provider = EntdatagouvProvider()
+    assert provider._siren_from_code("552100554") == "552100554"
+    assert provider._siren_from_code("552 100 554") == "552100554"
+    assert provider._siren_from_code("552 100 554 00029") == "552100554"
+    assert provider._siren_from_code("552100555") is None
+    assert provider._siren_from_code("5521") is None
+    assert provider._siren_from_code("") is None
+
+
+def test_validate_sirens():
+    """Batch validation keeps input order and rejects empty or malformed entries."""
+    provider = EntdatagouvProvider()
+    sirens = ["552100554", "356 000 000", "552100555", "", "W12345678", "55210055"]
+    assert provider.validate_sirens(sirens) == [True, True, False, False, False, False]
@@ -0,0 +1,97 @@
+"""Tests for the shared HTTP helper's conditional GETs."""
+
+import pytest
+
+from companyatlas.cache import TTLCache
+from companyatlas.providers.europe.france.entdatagouv import EntdatagouvProvider
+
+
+class FakeResponse:
+    """The parts of requests.Response that _get_json reads."""
+
+    def __init__(self, status_code, content=b"", headers=None):
+        self.status_code = status_code
+        self.content = content
+        self.headers = headers or {}
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise RuntimeError(self.status_code)
+
+
+class FakeSession:
+    """Session returning canned responses and recording request headers."""
+
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.requests = []
+
+    def get(self, url, **kwargs):
+        self.requests.append(kwargs.get("headers") or {})
+        return self.responses.pop(0)
+
+
+@pytest.fixture
+def provider(monkeypatch):
+    """Provider with empty caches, no rate limit and a fake session to fill in."""
+    monkeypatch.setattr(EntdatagouvProvider, "validator_cache", TTLCache())
+    monkeypatch.setattr(EntdatagouvProvider, "rate_limit", None)
+    provider = EntdatagouvProvider()
+    provider.get_http_session = lambda: provider.session
+    return provider
+
+
+def test_etag_then_304_reuses_body(provider):
+    """A 200 with an ETag is revalidated next time and a 304 returns the stored body."""
+    provider.session = FakeSession(
+        FakeResponse(200, b'{"results": [1]}', {"ETag": '"v1"'}),
+        FakeResponse(304),
+    )
+    assert provider._get_json("https://x.test/search", revalidate=True) == {"results": [1]}
+    assert provider._get_json("https://x.test/search", revalidate=True) == {"results": [1]}
+    assert provider.session.requests[0] == {}
+    assert provider.session.requests[1] == {"If-None-Match": '"v1"'}
+
+
+def test_last_modified_is_sent_back(provider):
+    """A Last-Modified header comes back as If-Modified-Since."""
+    stamp = "Wed, 01 Jan 2025 00:00:00 GMT"
+    provider.session = FakeSession(
+        FakeResponse(200, b"{}", {"Last-Modified": stamp}),
+        FakeResponse(200, b'{"a": 1}'),
+    )
+    provider._get_json("https://x.test/r", revalidate=True)
+    assert provider._get_json("https://x.test/r", revalidate=True) == {"a": 1}
+    assert provider.session.requests[1] == {"If-Modified-Since": stamp}
+
+
+def test_no_validators_nothing_stored(provider):
+    """Responses without ETag or Last-Modified are not remembered."""
+    provider.session = FakeSession(FakeResponse(200, b"{}"), FakeResponse(200, b"{}"))
+    provider._get_json("https://x.test/r", revalidate=True)
+    provider._get_json("https://x.test/r", revalidate=True)
+    assert provider.session.requests == [{}, {}]
+    assert len(provider.validator_cache) == 0
+
+
+def test_search_pages_are_not_stored(provider):
+    """Without revalidate, even a response with an ETag is not kept."""
+    provider.session = FakeSession(
+        FakeResponse(200, b"{}", {"ETag": '"v1"'}),
+        FakeResponse(200, b"{}", {"ETag": '"v1"'}),
+    )
+    provider._get_json("https://x.test/search", params={"q": "x"})
+    provider._get_json("https://x.test/search", params={"q": "x"})
+    assert provider.session.requests == [{}, {}]
+    assert len(provider.validator_cache) == 0
+
+
+@pytest.mark.parametrize(("limit", "expected"), [(20, 20), (500, 25), (0, 1)])
+def test_search_limit_is_clamped(provider, limit, expected):
+    """search_company never asks recherche-entreprises for more than 25 rows per page."""
+    provider.session = FakeSession(FakeResponse(200, b'{"results": []}'))
+    sent = []
+    get = provider.session.get
+    provider.session.get = lambda url, **kwargs: sent.append(kwargs["params"]) or get(url, **kwargs)
+    provider.search_company("danone", limit=limit)
+    assert sent[0]["per_page"] == expected
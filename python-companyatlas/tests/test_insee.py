@@ -0,0 +1,48 @@
+"""Tests for the INSEE SIRENE provider request building."""
+
+from urllib.parse import parse_qs, urlsplit
+
+from companyatlas.providers.europe.france.insee import InseeProvider
+
+
+def captured_url(provider):
+    """URL the provider requests for a SIREN lookup, without sending it."""
+    urls = []
+    provider.__dict__["_headers"] = {}
+    provider._get_json = lambda url, **kwargs: urls.append(url) or {}
+    provider._call_api("siren:552100554", nombre=1)
+    return urls[0]
+
+
+def captured_query(provider):
+    """Decoded query string of captured_url."""
+    return parse_qs(urlsplit(captured_url(provider)).query)
+
+
+def test_no_projection_by_default():
+    """Requests ask for every field unless a projection is set."""
+    assert "champs" not in captured_query(InseeProvider())
+
+
+def test_projection_sends_mapped_fields():
+    """projected_fields is sent as champs, in order."""
+    provider = InseeProvider()
+    provider.projected_fields = InseeProvider.SIRENE_MAPPED_FIELDS
+    champs = captured_query(provider)["champs"][0].split(",")
+    assert champs == list(InseeProvider.SIRENE_MAPPED_FIELDS)
+    assert "libellePaysEtrangerEtablissement" in champs
+
+
+def test_base_url_is_configurable():
+    """BASE_URL from config replaces the default endpoint."""
+    provider = InseeProvider(config={"BASE_URL": "https://sirene.example/3.11"})
+    assert captured_url(provider).startswith("https://sirene.example/3.11/siret?")
+
+
+def test_foreign_country_is_a_label_not_a_code():
+    """A foreign country name fills country only, never country_code."""
+    provider = InseeProvider()
+    data = {"adresseEtablissement": {"libellePaysEtrangerEtablissement": "ALLEMAGNE"}}
+    address = provider.get_normalize_address_json(data)
+    assert address["country"] == "ALLEMAGNE"
+    assert address["country_code"] == provider.geo_code
@@ -0,0 +1,50 @@
+"""Tests for provider field normalization."""
+
+from companyatlas.providers.europe.france.entdatagouv import EntdatagouvProvider
+
+
+class HookedProvider(EntdatagouvProvider):
+    """Provider with staticmethod and classmethod normalize hooks."""
+
+    name = "hooked"
+
+    @staticmethod
+    def get_normalize_static_field(data):
+        return "static"
+
+    @classmethod
+    def get_normalize_class_field(cls, data):
+        return cls.name
+
+
+def test_static_and_class_hooks():
+    """staticmethod and classmethod hooks are called with the result only."""
+    provider = HookedProvider()
+    assert provider.normalize_from_method_or_recursive({}, "static_field", {}) == "static"
+    assert provider.normalize_from_method_or_recursive({}, "class_field", {}) == "hooked"
+
+
+def test_instance_hook_overrides_class_hook():
+    """A hook set on the instance wins over the class method of the same name."""
+    provider = EntdatagouvProvider()
+    provider.get_normalize_country_code = lambda data: "XX"
+    assert provider.normalize_from_method_or_recursive({}, "country_code", {}) == "XX"
+    assert EntdatagouvProvider().normalize_from_method_or_recursive({}, "country_code", {}) == "FR"
+
+
+def test_source_path_without_hook():
+    """Fields without a hook are read from their source path."""
+    provider = EntdatagouvProvider()
+    data = {"siege": {"code_postal": "75001"}}
+    assert provider.normalize_from_method_or_recursive(data, "anything", {"source": "siege.code_postal"}) == "75001"
+
+
+def test_get_nested_value_walks_dicts_and_lists():
+    """Dotted paths walk dicts and list indexes, falling back to default."""
+    provider = EntdatagouvProvider()
+    data = {"siege": {}, "matching_etablissements": [{"numero_voie": "12"}]}
+    paths = ["siege.numero_voie", "matching_etablissements.0.numero_voie"]
+    assert provider._get_nested_value(data, paths) == "12"
+    assert provider._get_nested_value(data, "matching_etablissements.1.numero_voie", "-") == "-"
+    assert provider._get_nested_value(data, "matching_etablissements.x", "-") == "-"
+    assert provider._get_nested_value(data, "", "-") == "-"
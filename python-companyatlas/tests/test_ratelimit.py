@@ -0,0 +1,76 @@
+"""Tests for the provider rate limiter."""
+
+import pytest
+
+from companyatlas import ratelimit
+from companyatlas.ratelimit import RateLimiter
+
+
+class FakeClock:
+    """Monotonic clock that only moves when someone sleeps."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Patch the limiter to use a FakeClock."""
+    fake = FakeClock()
+    monkeypatch.setattr(ratelimit.time, "monotonic", fake.monotonic)
+    monkeypatch.setattr(ratelimit.time, "sleep", fake.sleep)
+    return fake
+
+
+def max_per_window(timestamps, window):
+    """Largest number of timestamps falling in any half-open window of the given width."""
+    return max(sum(1 for t in timestamps if start <= t < start + window - 1e-9) for start in timestamps)
+
+
+def acquire_times(limiter, clock, count):
+    """Clock times at which count successive acquire() calls return."""
+    times = []
+    for _ in range(count):
+        limiter.acquire()
+        times.append(clock.now)
+    return times
+
+
+@pytest.mark.parametrize(
+    ("rate", "window", "quota"),
+    [
+        (0.5, 60, 30),  # INSEE: 30 requests per minute
+        (7, 1, 7),  # recherche-entreprises: 7 requests per second
+    ],
+)
+def test_steady_rate_stays_within_quota(clock, rate, window, quota):
+    """Back-to-back calls never exceed the provider quota in any window."""
+    times = acquire_times(RateLimiter(rate), clock, quota * 4)
+    assert max_per_window(times, window) == quota
+
+
+def test_full_bucket_bursts_past_quota(clock):
+    """A large burst capacity lets more than the quota through in one window."""
+    times = acquire_times(RateLimiter(0.5, capacity=30), clock, 120)
+    assert max_per_window(times, 60) > 30
+
+
+def test_first_request_does_not_wait(clock):
+    """A fresh limiter lets the first request through at once."""
+    RateLimiter(1).acquire()
+    assert clock.now == 1000.0
+
+
+def test_idle_time_refills_at_most_capacity(clock):
+    """A long idle period only banks capacity tokens."""
+    limiter = RateLimiter(1)
+    limiter.acquire()
+    clock.now += 100
+    times = acquire_times(limiter, clock, 3)
+    assert times == [1100.0, 1101.0, 1102.0]